@@ -1,21 +1,113 @@
-from fastapi import FastAPI, Query
-from search_engine import ArabicSearchEngine
+import gc
 import json
+import os
+import threading
+import time
+
+from fastapi import FastAPI, HTTPException, Query
+from search_engine import ArabicSearchEngine
+
+CONFIG_PATH = os.environ.get("SEARCH_CONFIG", "config.json")
+# SEARCH_PRELOAD=1 builds the engine at import time. Run with
+#   gunicorn api:app -k uvicorn.workers.UvicornWorker --preload -w 4
+# so the master loads the index once and the forked workers share its
+# read-only pages copy-on-write instead of each loading their own.
+# In that mode torch runs single-threaded and HF tokenizers without their
+# own thread pool (see below): pools started in the master don't survive
+# the fork and can deadlock the workers. Scale with -w instead of threads.
+PRELOAD = os.environ.get("SEARCH_PRELOAD", "0") == "1"
+
+_IMPORTED_AT = time.monotonic()
 
 app = FastAPI()
-search_engine = ArabicSearchEngine("config.json")
 
+with open(CONFIG_PATH, encoding="utf-8") as f:
+    config = json.load(f)
+
+search_engine = None
+_load_error = None
+_ready_after = None
+_ready = threading.Event()
+
+
+def _rss_mb():
+    """Current resident set size of this process in MB (None if unavailable)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return None
+
+
+def _build_engine():
+    global search_engine, _load_error, _ready_after
+    try:
+        search_engine = ArabicSearchEngine(CONFIG_PATH)
+        _ready_after = time.monotonic() - _IMPORTED_AT
+        print(f"Search engine ready after {_ready_after:.1f}s (RSS {_rss_mb()} MB)")
+        _ready.set()
+    except Exception as e:
+        _load_error = repr(e)
+        print(f"Search engine failed to load: {_load_error}")
+
+
+if PRELOAD:
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    import torch
+    torch.set_num_threads(1)
+    torch.set_num_interop_threads(1)
+    _build_engine()
+    # Move everything allocated so far out of the GC's generations so that
+    # collections in the workers don't write to (and un-share) these pages.
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+
+@app.on_event("startup")
+async def warm_up():
+    if not _ready.is_set() and _load_error is None:
+        threading.Thread(target=_build_engine, name="engine-warmup", daemon=True).start()
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "alive", "pid": os.getpid(), "rss_mb": _rss_mb()}
+
+
+@app.get("/readyz")
+async def readyz():
+    body = {
+        "ready": _ready.is_set(),
+        "pid": os.getpid(),
+        "preloaded": PRELOAD,
+        "ready_after_seconds": _ready_after,
+        "rss_mb": _rss_mb(),
+    }
+    if _load_error is not None:
+        body["error"] = _load_error
+    if not _ready.is_set():
+        raise HTTPException(status_code=503, detail=body)
+    return body
+
+
+# Plain `def` endpoints run in FastAPI's threadpool, so a search blocked in
+# model.encode() (or a file read) never stalls /healthz and /readyz.
 @app.get("/search/")
-async def semantic_search(
+def semantic_search(
     query: str = Query(..., min_length=3),
     search_type: str = Query("both", regex="^(quran|hadith|both)$"),
     top_k: int = Query(5, ge=1, le=20)
 ):
+    if not _ready.is_set():
+        raise HTTPException(status_code=503, detail="Search index is still loading")
     return search_engine.search(query, search_type, top_k)
 
 @app.get("/verse/{surah_idx}/{verse_idx}")
-async def get_verse_details(surah_idx: int, verse_idx: int):
-    with open(search_engine.config["data_paths"]["quran"], 'r', encoding='utf-8') as f:
+def get_verse_details(surah_idx: int, verse_idx: int):
+    with open(config["data_paths"]["quran"], 'r', encoding='utf-8') as f:
         quran = json.load(f)
     return {
         "verse": quran[surah_idx]["verses"][verse_idx],
@@ -23,4 +115,4 @@ async def get_verse_details(surah_idx: int, verse_idx: int):
             "previous": quran[surah_idx]["verses"][verse_idx-1] if verse_idx > 0 else None,
             "next": quran[surah_idx]["verses"][verse_idx+1] if verse_idx < len(quran[surah_idx]["verses"])-1 else None
         }
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,162 @@
+"""Benchmark MinHash/LSH hadith deduplication.
+
+Synthetic corpora mimic how Bukhari repeats hadiths: every matn (hadith
+body) appears 1-4 times under different chains of narrators, with small
+wording changes and abridgements, while a small pool of isnads (chains) is
+shared by many *different* matns. Words are sampled from the Qur'an's word
+frequencies, so frequent words are frequent. Reported next to the
+index-size reduction:
+
+  false  docs merged into a cluster whose representative is another hadith
+  missed docs left outside the cluster of their own hadith (lost reduction)
+
+A handful of hand-written cases (shared Malik->Nafi'->Ibn 'Umar isnad with
+different matns; "انما الاعمال بالنيات" under two isnads) are checked too.
+
+    python bench_dedup.py [--sizes 1000 10000 30000] [--threshold 0.5]
+    python bench_dedup.py --whole-text      # hash the isnad too, for comparison
+    python bench_dedup.py --corpus ../../../CleanedData/bukhari_all_arabic_cleaned.json
+"""
+import argparse
+import json
+import random
+from collections import defaultdict
+from pathlib import Path
+
+from dedup import MinHashDeduplicator
+
+QURAN = Path(__file__).resolve().parents[3] / "CleanedData" / "quran_cleaned_arabic.json"
+NARRATORS = ["مالك", "نافع", "سفيان", "الزهري", "شعبه", "قتاده", "انس", "ابو هريره",
+             "عايشه", "ابن عباس", "عبد الله بن عمر", "يحيي بن سعيد", "الاعمش", "ابراهيم",
+             "هشام بن عروه", "عروه", "ابو سلمه", "سعيد بن المسيب", "الليث", "عقيل"]
+VERBS = ["حدثنا", "اخبرنا", "حدثني", "اخبرني"]
+
+MALIK = ("حدثنا عبد الله بن يوسف قال اخبرنا مالك عن نافع عن عبد الله بن عمر "
+         "رضي الله عنهما ان رسول الله صلي الله عليه وسلم ")
+CASES = [
+    ("shared isnad, 4 different matns", [
+        MALIK + "قال صلاه الجماعه تفضل صلاه الفذ بسبع وعشرين درجه",
+        MALIK + "قال اذا جاء احدكم الجمعه فليغتسل",
+        MALIK + "نهي عن الشغار والشغار ان يزوج الرجل ابنته علي ان يزوجه الاخر ابنته ليس بينهما صداق",
+        MALIK + "قال الذي تفوته صلاه العصر كانما وتر اهله وماله",
+    ], [0, 1, 2, 3]),
+    ("same matn, 2 different isnads", [
+        "حدثنا الحميدي عبد الله بن الزبير قال حدثنا سفيان قال حدثنا يحيي بن سعيد الانصاري "
+        "قال اخبرني محمد بن ابراهيم التيمي انه سمع علقمه بن وقاص الليثي يقول سمعت عمر بن "
+        "الخطاب رضي الله عنه علي المنبر قال سمعت رسول الله صلي الله عليه وسلم يقول انما "
+        "الاعمال بالنيات وانما لكل امري ما نوي فمن كانت هجرته الي دنيا يصيبها او الي امراه "
+        "ينكحها فهجرته الي ما هاجر اليه",
+        "حدثنا قتيبه بن سعيد قال حدثنا عبد الوهاب قال سمعت يحيي بن سعيد يقول اخبرني محمد "
+        "بن ابراهيم انه سمع علقمه بن وقاص يقول سمعت عمر بن الخطاب يقول سمعت رسول الله صلي "
+        "الله عليه وسلم يقول انما الاعمال بالنيه وانما لامري ما نوي فمن كانت هجرته الي الله "
+        "ورسوله فهجرته الي الله ورسوله ومن كانت هجرته الي دنيا يصيبها او امراه يتزوجها "
+        "فهجرته الي ما هاجر اليه",
+    ], [0, 0]),
+]
+
+
+def quran_words():
+    with open(QURAN, encoding="utf-8") as f:
+        return [w for s in json.load(f) for v in s["verses"] for w in v.split()]
+
+
+def make_isnad(rng):
+    chain = rng.sample(NARRATORS, rng.randint(3, 5))
+    parts = [f"{rng.choice(VERBS)} {chain[0]} قال {rng.choice(VERBS)} {chain[1]}"]
+    parts += [f"عن {name}" for name in chain[2:]]
+    tail = rng.choice(["ان رسول الله صلي الله عليه وسلم قال", "عن النبي صلي الله عليه وسلم قال",
+                       "قال قال النبي صلي الله عليه وسلم"])
+    return " ".join(parts + [tail])
+
+
+def make_variant(matn, words, rng):
+    body = list(matn)
+    if len(body) > 12 and rng.random() < 0.3:  # abridged narration
+        body = body[: int(len(body) * rng.uniform(0.75, 1.0))]
+    for _ in range(max(1, len(body) // 15)):  # small wording changes
+        body[rng.randrange(len(body))] = rng.choice(words)
+    return body
+
+
+def make_corpus(n, words, rng):
+    isnads = [make_isnad(rng) for _ in range(max(5, n // 50))]  # heavily shared chains
+    texts, truth = [], []
+    hadith_id = 0
+    while len(texts) < n:
+        # Words drawn independently (not a Qur'an passage) so that different
+        # hadiths don't share text by construction, only frequent words
+        matn = rng.choices(words, k=rng.randint(6, 60))
+        for copy in range(rng.choice((1, 1, 2, 3, 4))):
+            body = matn if copy == 0 else make_variant(matn, words, rng)
+            texts.append(rng.choice(isnads) + " " + " ".join(body))
+            truth.append(hadith_id)
+        hadith_id += 1
+    return texts[:n], truth[:n]
+
+
+def score(clusters, truth):
+    """(false merges, missed merges, ideal cluster count) against ground truth."""
+    false = sum(truth[i] != truth[c[0]] for c in clusters for i in c)
+    spread = defaultdict(set)
+    for k, c in enumerate(clusters):
+        for i in c:
+            if truth[i] == truth[c[0]]:
+                spread[truth[i]].add(k)
+    ideal = len(set(truth))
+    missed = sum(len(ks) - 1 for ks in spread.values()) + sum(
+        1 for h in set(truth) if h not in spread)
+    return false, missed, ideal
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 30_000])
+    ap.add_argument("--corpus", help="Bukhari JSON to measure instead of synthetic data")
+    ap.add_argument("--threshold", type=float, default=0.5)
+    ap.add_argument("--shingle-size", type=int, default=1)
+    ap.add_argument("--whole-text", action="store_true", help="don't strip the isnad")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    dedup = MinHashDeduplicator(threshold=args.threshold, shingle_size=args.shingle_size,
+                                matn_only=not args.whole_text)
+
+    for label, texts, expected in CASES:
+        got = dedup.cluster(texts)
+        labels = [0] * len(texts)
+        for k, c in enumerate(got):
+            for i in c:
+                labels[i] = k
+        ok = all((labels[i] == labels[j]) == (expected[i] == expected[j])
+                 for i in range(len(texts)) for j in range(len(texts)))
+        print(f"{'ok' if ok else 'FAIL':>4}  {label}: {got}")
+    print()
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            data = json.load(f)
+        texts = [(h.get("cleaned_arabic") or h.get("original_text") or "").strip()
+                 for h in data if isinstance(h, dict)]
+        dedup.cluster([t for t in texts if len(t.split()) >= 2])
+        st = dedup.stats
+        print(f"bukhari: {st['documents']} docs -> {st['clusters']} clusters "
+              f"({st['reduction']:.1%} smaller) in {st['seconds']:.2f}s "
+              f"({st['docs_per_second']:.0f} docs/s, {st['comparisons']} comparisons)")
+        return
+
+    print(f"{'corpus':>10} {'docs':>7} {'clusters':>9} {'ideal':>7} {'reduction':>9} "
+          f"{'ideal red.':>10} {'false':>6} {'missed':>7} {'seconds':>8} {'docs/s':>7} "
+          f"{'comparisons':>11}")
+    words = quran_words()
+    for size in args.sizes:
+        texts, truth = make_corpus(size, words, random.Random(args.seed))
+        clusters = dedup.cluster(texts)
+        st = dedup.stats
+        false, missed, ideal = score(clusters, truth)
+        print(f"{'synthetic':>10} {size:>7} {st['clusters']:>9} {ideal:>7} {st['reduction']:>9.1%} "
+              f"{1 - ideal / size:>10.1%} {false:>6} {missed:>7} {st['seconds']:>8.2f} "
+              f"{st['docs_per_second']:>7.0f} {st['comparisons']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark query expansion latency against lexicon size.
+
+Synthetic lexicons of 10, 10k and 100k entries are compiled into an
+IslamicLexicon and timed against the old approach (loop over every entry
+doing `term in query`).
+
+    python bench_expansion.py [--sizes 10 10000 100000] [--queries 2000]
+"""
+import argparse
+import random
+import time
+
+from lexicon import IslamicLexicon
+
+LETTERS = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+REAL_QUERIES = ["الرحمة في الإسلام", "الصبر على المصائب", "فضل الزكاة والصدقة"]
+
+
+def random_word(rng, lo=3, hi=7):
+    return "".join(rng.choice(LETTERS) for _ in range(rng.randint(lo, hi)))
+
+
+def make_entries(n, rng):
+    entries = {}
+    while len(entries) < n:
+        head = " ".join(random_word(rng) for _ in range(rng.choice((1, 1, 1, 2))))
+        entries[head] = " ".join(random_word(rng) for _ in range(rng.randint(3, 8)))
+    return entries
+
+
+def make_queries(entries, n, rng):
+    heads = list(entries)
+    queries = []
+    for i in range(n):
+        words = [random_word(rng) for _ in range(rng.randint(2, 6))]
+        if i % 2 == 0:  # half the queries hit at least one headword
+            words.insert(rng.randrange(len(words) + 1), rng.choice(heads))
+        queries.append(" ".join(words))
+    return queries + REAL_QUERIES
+
+
+def naive_expand(entries, query):
+    expanded = [query]
+    for term, exp in entries.items():
+        if term in query and exp:
+            expanded.append(exp)
+    return " ".join(expanded).strip()
+
+
+def per_query_us(fn, queries):
+    t0 = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - t0) / len(queries) * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 10_000, 100_000])
+    ap.add_argument("--queries", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    print(f"{'entries':>8} {'build s':>8} {'nodes':>8} {'automaton us/q':>15} {'naive us/q':>11}")
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        entries = make_entries(size, rng)
+        queries = make_queries(entries, args.queries, rng)
+
+        t0 = time.perf_counter()
+        lexicon = IslamicLexicon(entries)
+        build = time.perf_counter() - t0
+
+        auto = per_query_us(lexicon.expand, queries)
+        # The naive loop is O(entries) per query; sample fewer queries at scale
+        sample = queries[: max(20, len(queries) * 100 // max(size, 100))]
+        naive = per_query_us(lambda q: naive_expand(entries, q), sample)
+        print(f"{size:>8} {build:>8.2f} {len(lexicon.automaton):>8} {auto:>15.1f} {naive:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Measure API startup: time-to-first-byte on /healthz, time until /readyz
+reports the index loaded, and per-worker RSS and PSS. RSS counts pages
+shared copy-on-write in full; PSS splits them between the sharers, so it is
+the number that shows what --preload saves.
+
+    python bench_startup.py                 # uvicorn, lazy warm-up
+    python bench_startup.py --workers 4     # uvicorn, one index per worker
+    python bench_startup.py --workers 4 --preload   # gunicorn preload+fork
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def get(url, timeout=2.0):
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as r:
+            return r.status, json.loads(r.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        return e.code, None
+    except (urllib.error.URLError, ConnectionError, OSError):
+        return None, None
+
+
+def _proc_kb(path, key):
+    try:
+        with open(path, encoding="ascii") as f:
+            for line in f:
+                if line.startswith(key):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return None
+
+
+def rss_mb(pid):
+    return _proc_kb(f"/proc/{pid}/status", "VmRSS:")
+
+
+def pss_mb(pid):
+    return _proc_kb(f"/proc/{pid}/smaps_rollup", "Pss:")
+
+
+def fmt_mb(value):
+    return "n/a" if value is None else f"{value:.0f} MB"
+
+
+def children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", encoding="ascii") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--preload", action="store_true")
+    ap.add_argument("--timeout", type=float, default=1800.0)
+    ap.add_argument("--settle", type=float, default=60.0,
+                    help="seconds to wait after first ready before sampling memory")
+    args = ap.parse_args()
+
+    env = dict(os.environ)
+    if args.preload:
+        env["SEARCH_PRELOAD"] = "1"
+        cmd = ["gunicorn", "api:app", "-k", "uvicorn.workers.UvicornWorker",
+               "--preload", "-w", str(args.workers), "-b", f"127.0.0.1:{args.port}"]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "api:app",
+               "--port", str(args.port), "--workers", str(args.workers)]
+
+    base = f"http://127.0.0.1:{args.port}"
+    t0 = time.monotonic()
+    proc = subprocess.Popen(cmd, env=env)
+    ttfb = ready = None
+    try:
+        while time.monotonic() - t0 < args.timeout:
+            if proc.poll() is not None:
+                print("Server exited early")
+                return 1
+            status, _ = get(base + "/healthz")
+            if status == 200 and ttfb is None:
+                ttfb = time.monotonic() - t0
+                print(f"time to first byte (/healthz): {ttfb:.2f}s")
+            if ttfb is not None:
+                status, _ = get(base + "/readyz")
+                if status == 200:
+                    ready = time.monotonic() - t0
+                    print(f"time to ready (/readyz):       {ready:.2f}s")
+                    break
+            time.sleep(0.2)
+        else:
+            print("Timed out waiting for readiness")
+            return 1
+
+        if args.workers > 1:
+            # /readyz answers from one worker; wait for the rest to finish loading
+            time.sleep(args.settle)
+        pids = [proc.pid] + children(proc.pid)
+        total_pss = 0.0
+        for pid in pids:
+            role = "master" if pid == proc.pid else "worker"
+            pss = pss_mb(pid)
+            total_pss += pss or 0.0
+            print(f"{role} pid {pid}: RSS {fmt_mb(rss_mb(pid))}, PSS {fmt_mb(pss)}")
+        print(f"total PSS: {total_pss:.0f} MB")
+        return 0
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
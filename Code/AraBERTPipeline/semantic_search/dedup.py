@@ -0,0 +1,139 @@
+import re
+import time
+import zlib
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+_PRIME = (1 << 31) - 1  # Mersenne prime; a * h stays below 2**63 in uint64
+_NON_LETTERS = re.compile(r"[^ء-ي]")
+
+# Cleaned (ArabicCleaner) forms of the transmission vocabulary
+_PROPHET_FORMULA = ["صلي", "الله", "عليه", "وسلم"]
+_ISNAD_MARKERS = {"حدثنا", "حدثني", "اخبرنا", "اخبرني", "انبانا", "سمعت", "عن"}
+_SPEECH_VERBS = {"قال", "قالت", "يقول", "تقول", "انه", "انها"}
+_MIN_MATN = 3
+
+
+def strip_isnad(tokens: List[str]) -> List[str]:
+    """Drop the chain of narrators from a tokenized hadith, keeping the matn.
+
+    The matn starts after the first "صلى الله عليه وسلم" if there is one
+    ("... عن النبي صلى الله عليه وسلم قال <matn>"), otherwise after the
+    narrator named by the last transmission marker (حدثنا/عن/سمعت ...).
+    Leading speech verbs are skipped. If that leaves almost nothing the
+    tokens are returned unchanged, so a missed heuristic degrades to
+    whole-text comparison rather than to an empty shingle set.
+    """
+    n, k = len(tokens), len(_PROPHET_FORMULA)
+    cut = next((i + k for i in range(n - k + 1) if tokens[i:i + k] == _PROPHET_FORMULA), None)
+    if cut is None:
+        head = int(n * 0.7)
+        markers = [i for i in range(head) if tokens[i] in _ISNAD_MARKERS]
+        if not markers:
+            return tokens
+        cut = markers[-1] + 1
+        verb = next((i for i in range(cut, min(cut + 12, n)) if tokens[i] in _SPEECH_VERBS), None)
+        if verb is not None:
+            cut = verb
+    while cut < n and tokens[cut] in _SPEECH_VERBS:
+        cut += 1
+    return tokens[cut:] if n - cut >= _MIN_MATN else tokens
+
+
+class MinHashDeduplicator:
+    """Groups near-duplicate hadiths with MinHash signatures + LSH banding.
+
+    Each text becomes a set of word shingles over its matn (see strip_isnad;
+    a shared chain of narrators says nothing about the hadith body). MinHash
+    signatures are cut into `bands` bands and a text is only compared with
+    the cluster representatives it shares a bucket with, so the cost grows
+    with corpus size rather than with the number of pairs.
+
+    A text joins the representative whose *exact* shingle Jaccard is highest
+    and at least `threshold`; otherwise it starts a new cluster. Members are
+    therefore each similar to their representative, and clusters never chain
+    through intermediate texts.
+    """
+
+    def __init__(self, threshold: float = 0.5, num_perm: int = 128, bands: int = 32,
+                 shingle_size: int = 1, seed: int = 1, matn_only: bool = True,
+                 tokenize: Optional[Callable[[str], List[str]]] = None):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.matn_only = matn_only
+        self.tokenize = tokenize or str.split
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.stats: Dict[str, float] = {}
+
+    # ---------- Signatures ----------
+    def _tokens(self, text: str) -> List[str]:
+        tokens = [t for t in (_NON_LETTERS.sub("", tok) for tok in self.tokenize(text)) if t]
+        return strip_isnad(tokens) if self.matn_only else tokens
+
+    def shingles(self, text: str) -> Set[int]:
+        tokens = self._tokens(text)
+        k = min(self.shingle_size, len(tokens)) or 1
+        # crc32 rather than hash() so signatures are stable across processes
+        return {zlib.crc32(" ".join(tokens[i:i + k]).encode("utf-8")) % _PRIME
+                for i in range(max(len(tokens) - k + 1, 1))}
+
+    def signature(self, shingles: Set[int]) -> np.ndarray:
+        h = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        return ((self._a[:, None] * h[None, :] + self._b[:, None]) % _PRIME).min(axis=1)
+
+    # ---------- Clustering ----------
+    def cluster(self, texts: List[str]) -> List[List[int]]:
+        """Return clusters of indices into `texts`, each sorted ascending, so
+        the first index is the representative (earliest occurrence).
+        Singletons are included."""
+        t0 = time.perf_counter()
+        shingle_sets = [self.shingles(t) for t in texts]
+
+        buckets = [defaultdict(list) for _ in range(self.bands)]  # representatives only
+        clusters: Dict[int, List[int]] = {}
+        comparisons = 0
+        for i, sh in enumerate(shingle_sets):
+            sig = self.signature(sh)
+            keys = [sig[b * self.rows:(b + 1) * self.rows].tobytes() for b in range(self.bands)]
+
+            candidates = set()
+            for band, key in zip(buckets, keys):
+                candidates.update(band.get(key, ()))
+
+            best, best_sim = None, self.threshold
+            for rep in sorted(candidates):
+                rep_sh = shingle_sets[rep]
+                comparisons += 1
+                sim = len(sh & rep_sh) / len(sh | rep_sh)
+                if sim > best_sim or (sim == best_sim and best is None):
+                    best, best_sim = rep, sim
+
+            if best is not None:
+                clusters[best].append(i)
+            else:
+                clusters[i] = [i]
+                for band, key in zip(buckets, keys):
+                    band[key].append(i)
+
+        result = [clusters[rep] for rep in sorted(clusters)]
+
+        elapsed = time.perf_counter() - t0
+        self.stats = {
+            "documents": len(texts),
+            "clusters": len(result),
+            "reduction": 1.0 - len(result) / len(texts) if texts else 0.0,
+            "comparisons": comparisons,
+            "seconds": elapsed,
+            "docs_per_second": len(texts) / elapsed if elapsed > 0 else float("inf"),
+        }
+        return result
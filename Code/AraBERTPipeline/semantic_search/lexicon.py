@@ -0,0 +1,189 @@
+import json
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Cleaner_Arabic.py lives in Code/, two levels up from this package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from Cleaner_Arabic import ArabicCleaner  # noqa: E402
+
+
+class TermAutomaton:
+    """Aho-Corasick automaton over *tokens* rather than characters.
+
+    Patterns are token sequences, so a match always starts and ends on a word
+    boundary ("في" can never match inside "يكفي"). Building is linear in the
+    total pattern length; scanning is linear in the number of input tokens
+    plus the number of matches, independent of how many patterns exist.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]  # (pattern_len, value)
+        self._built = False
+
+    def add(self, tokens: Tuple[str, ...], value: int) -> None:
+        if not tokens:
+            return
+        node = 0
+        for tok in tokens:
+            nxt = self._goto[node].get(tok)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][tok] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(tokens), value))
+        self._built = False
+
+    def build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for tok, child in self._goto[node].items():
+                f = self._fail[node]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(tok, 0)
+                # Inherit the outputs of the fail state (shorter suffix matches)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+        self._built = True
+
+    def iter_matches(self, tokens: List[str]) -> Iterable[Tuple[int, int, int]]:
+        """Yield (start, end, value) for every pattern occurring in tokens."""
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, tok in enumerate(tokens):
+            while node and tok not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(tok, 0)
+            for length, value in out[node]:
+                yield i - length + 1, i + 1, value
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+
+class IslamicLexicon:
+    """Query-expansion thesaurus compiled once into a TermAutomaton.
+
+    Every headword and every expansion term gets an integer id and is added to
+    the same automaton, so one scan of a text tells us both which headwords a
+    query contains and which expansion terms a candidate passage contains.
+    All text goes through ArabicCleaner first so it lines up with the corpus.
+
+    Matching is on whole tokens, so a clitic glued to a word ("والصدقة",
+    "بالرحمة") would hide it; match_tokens() retries such tokens with one
+    و/ف/ب/ل/ك prefix removed when that yields a lexicon word.
+    """
+
+    PROCLITICS = "وفبلك"
+
+    def __init__(self, entries: Dict[str, str], cleaner: Optional[ArabicCleaner] = None):
+        self.cleaner = cleaner or ArabicCleaner()
+        self.automaton = TermAutomaton()
+        self._term_ids: Dict[Tuple[str, ...], int] = {}
+        self._terms: List[str] = []
+        self._expansions: Dict[int, List[int]] = {}  # headword id -> term ids
+        self._raw_ids: Dict[str, Optional[int]] = {}  # skip re-cleaning repeated terms
+
+        for head, expansion in entries.items():
+            head_id = self._term_id(head)
+            if head_id is None:
+                continue
+            exp_ids = self._expansions.setdefault(head_id, [])
+            for term in (expansion or "").split():
+                term_id = self._term_id(term)
+                if term_id is not None and term_id not in exp_ids:
+                    exp_ids.append(term_id)
+        self._vocab: Set[str] = {tok for term in self._term_ids for tok in term}
+        self.automaton.build()
+
+    # ---------- Loading ----------
+    @classmethod
+    def from_file(cls, path: str, cleaner: Optional[ArabicCleaner] = None) -> "IslamicLexicon":
+        """Load a lexicon from JSON ({"term": "expansion words", ...}) or from a
+        tab-separated file with one `term<TAB>expansion words` entry per line."""
+        path = Path(path)
+        with open(path, encoding="utf-8") as f:
+            if path.suffix.lower() == ".json":
+                entries = json.load(f)
+            else:
+                entries = {}
+                for line in f:
+                    line = line.rstrip("\n")
+                    if not line.strip() or line.startswith("#"):
+                        continue
+                    head, _, expansion = line.partition("\t")
+                    entries[head] = expansion
+        return cls(entries, cleaner)
+
+    def _term_id(self, term: str) -> Optional[int]:
+        if term in self._raw_ids:
+            return self._raw_ids[term]
+        tokens = tuple(self.tokens(term))
+        if not tokens:
+            self._raw_ids[term] = None
+            return None
+        term_id = self._term_ids.get(tokens)
+        if term_id is None:
+            term_id = len(self._terms)
+            self._term_ids[tokens] = term_id
+            self._terms.append(" ".join(tokens))
+            self.automaton.add(tokens, term_id)
+        self._raw_ids[term] = term_id
+        return term_id
+
+    # ---------- Matching ----------
+    def tokens(self, text: str) -> List[str]:
+        return self.cleaner.clean(text or "").split()
+
+    def _strip_proclitic(self, tok: str) -> str:
+        if (tok not in self._vocab and len(tok) > 3 and tok[0] in self.PROCLITICS
+                and tok[1:] in self._vocab):
+            return tok[1:]
+        return tok
+
+    def match_tokens(self, text: str) -> List[str]:
+        """Cleaned tokens with the single-proclitic fallback applied; this is
+        what match_ids() expects. Index texts once with it, not per query."""
+        return [self._strip_proclitic(tok) for tok in self.tokens(text)]
+
+    def match_ids(self, text_or_tokens) -> Set[int]:
+        """Ids of all lexicon terms (headwords or expansion terms) in the text.
+        Pass a string, or tokens already produced by match_tokens()."""
+        tokens = self.match_tokens(text_or_tokens) if isinstance(text_or_tokens, str) else text_or_tokens
+        return {value for _, _, value in self.automaton.iter_matches(tokens)}
+
+    def expansion_ids(self, query: str) -> Set[int]:
+        """Ids of the headwords found in the query plus all of their expansions."""
+        ids = set()
+        for term_id in self.match_ids(query):
+            if term_id in self._expansions:
+                ids.add(term_id)
+                ids.update(self._expansions[term_id])
+        return ids
+
+    def expand(self, query: str) -> str:
+        tokens = self.tokens(query)
+        expanded = [" ".join(tokens)]
+        seen = set()
+        matchable = [self._strip_proclitic(tok) for tok in tokens]
+        for _, _, term_id in self.automaton.iter_matches(matchable):
+            if term_id in seen:
+                continue
+            seen.add(term_id)
+            exp = self._expansions.get(term_id)
+            if exp:
+                expanded.append(" ".join(self._terms[i] for i in exp))
+        return " ".join(expanded).strip()
+
+    def __len__(self) -> int:
+        return len(self._expansions)
@@ -49,6 +49,10 @@ def print_hadith_hits(hits, min_score=MIN_SCORE_HADITH):
         citation = meta.get("book_title_ar") or meta.get("citation") or "صحيح البخاري"
         print(f"{i}. {text}")
         print(f"   → {citation}")
+        variants = meta.get("variants") or []
+        if variants:
+            # Near-duplicate copies collapsed into this hit by the engine
+            print(f"   → Also in: {'، '.join(dict.fromkeys(variants))}")
         print(f"   → Relevance: {score:.3f}")
         shown_any = True
     if not shown_any:
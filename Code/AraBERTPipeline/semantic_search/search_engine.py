@@ -1,15 +1,29 @@
 import json
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import torch
 from pathlib import Path
 from typing import List, Dict, Union, Tuple, Any
+from lexicon import IslamicLexicon
+from dedup import MinHashDeduplicator
 
 class ArabicSearchEngine:
     def __init__(self, config_path: str):
         with open(config_path, encoding='utf-8') as f:
             self.config = json.load(f)
 
+        # Query-expansion thesaurus, compiled once into a token automaton.
+        # Relative paths are resolved against the config file's directory.
+        lexicon_path = Path(self.config.get("search_settings", {})
+                            .get("lexicon_path", "islamic_lexicon.json"))
+        if not lexicon_path.is_absolute():
+            lexicon_path = Path(config_path).resolve().parent / lexicon_path
+        self.lexicon = IslamicLexicon.from_file(str(lexicon_path))
+        print(f"Loaded lexicon with {len(self.lexicon)} entries from {lexicon_path}")
+
+        # Heavy deps imported here so that importing this module stays cheap
+        # (api.py can bind its port before torch is ever loaded).
+        import torch
+        from sentence_transformers import SentenceTransformer
+
         self.model = SentenceTransformer(
             self.config["model_settings"]["model_name"],
             device='cuda' if torch.cuda.is_available() else 'cpu'
@@ -25,7 +39,12 @@ class ArabicSearchEngine:
          self.quran_metas)  = self._flatten_quran(self.quran_data)
 
         (self.hadith_texts,
-         self.hadith_metas) = self._flatten_hadith(self.hadith_data)
+         self.hadith_metas) = self._dedup_hadith(*self._flatten_hadith(self.hadith_data))
+
+        # Cleaned, lexicon-ready tokens for the boost checks in search(),
+        # computed once here so queries don't re-clean every candidate
+        self.quran_tokens  = [self.lexicon.match_tokens(t) for t in self.quran_texts]
+        self.hadith_tokens = [self.lexicon.match_tokens(t) for t in self.hadith_texts]
 
         self.quran_embeddings  = self._embed_and_normalize(self.quran_texts, "quran")
         self.hadith_embeddings = self._embed_and_normalize(self.hadith_texts, "hadith")
@@ -162,6 +181,36 @@ class ArabicSearchEngine:
 
         return texts, metas
 
+    # ---------- Near-duplicate collapsing ----------
+    def _dedup_hadith(self, texts: List[str], metas: List[Dict[str, Any]]) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """Bukhari repeats many hadiths across books with small isnad changes.
+        Keep one representative per near-duplicate cluster (its first occurrence)
+        and record the other copies' citations under meta["variants"].
+        Off unless search_settings.dedup_hadith is set: dropped texts can't be
+        recovered at query time, so enable it after checking bench_dedup.py
+        against the real corpus."""
+        settings = self.config.get("search_settings", {})
+        if not settings.get("dedup_hadith", False) or not texts:
+            return texts, metas
+
+        dedup = MinHashDeduplicator(threshold=settings.get("dedup_threshold", 0.5),
+                                    tokenize=self.lexicon.tokens)
+        clusters = dedup.cluster(texts)
+
+        kept_texts, kept_metas = [], []
+        for cluster in clusters:
+            rep = cluster[0]
+            meta = dict(metas[rep])
+            meta["variants"] = [metas[j]["citation"] for j in cluster[1:]]
+            kept_texts.append(texts[rep])
+            kept_metas.append(meta)
+
+        st = dedup.stats
+        print(f"Hadith dedup: {st['documents']} -> {st['clusters']} items "
+              f"({st['reduction']:.1%} smaller index) in {st['seconds']:.2f}s "
+              f"({st['docs_per_second']:.0f} docs/s)")
+        return kept_texts, kept_metas
+
     # ---------- Embeddings ----------
     def _embed_and_normalize(self, texts: List[str], label: str) -> np.ndarray:
         print(f"\nDebug: Computing embeddings for {label}… ({len(texts)} texts)")
@@ -178,21 +227,20 @@ class ArabicSearchEngine:
 
     # ---------- Query expansion ----------
     def expand_islamic_query(self, query: str) -> str:
-        islamic_expansion = {
-            "الرحمة": "الرحمن الرحيم رحمة واسعة المغفرة العفو",
-            "الصبر": "الصابرين المصائب البلاء الاحتساب الثواب الأجر الصمود التحمل",
-            "الزكاة": "الصدقة الفقراء المساكين المحتاجين الإنفاق التطوع",
-            "المصائب": "البلاء المصائب الشدائد الصبر الاحتساب الثواب المحن",
-            "الإسلام": "الإيمان التوحيد المسلمون الدين الله الرسول",
-            "الفضل": "الثواب الأجر الخير البركة الفضائل المكافأة",
-            "الصدقة": "التبرع العطاء المساعدة الفقراء المحتاجين البر",
-            "في": "", "على": "", "من": "", "ال": "", "وا": ""
-        }
-        expanded = [query]
-        for term, exp in islamic_expansion.items():
-            if term in query and exp:
-                expanded.append(exp)
-        return " ".join(expanded).strip()
+        """Cleaned query followed by the expansions of every lexicon headword
+        it contains (token-bounded, so stopwords never match inside words)."""
+        return self.lexicon.expand(query)
+
+    def _boost(self, score: float, tokens: List[str], query_tokens: set, expansion_ids: set,
+               query_factor: float, expansion_factor: float) -> float:
+        """Boost a candidate that shares a query word and/or an expansion term.
+        `tokens` are the candidate's precomputed match_tokens(); the lexicon
+        automaton scans them once."""
+        if query_tokens and not query_tokens.isdisjoint(tokens):
+            score = min(1.0, score * query_factor)
+        if expansion_ids and not expansion_ids.isdisjoint(self.lexicon.match_ids(tokens)):
+            score = min(1.0, score * expansion_factor)
+        return score
 
     # ---------- Search ----------
     def search(self, query: str, search_type: str = "both", top_k: int = 10) -> Dict:
@@ -203,6 +251,9 @@ class ArabicSearchEngine:
         print(f"Original query: '{original_query}'")
         print(f"Expanded query: '{expanded_query}'")
 
+        query_tokens = {w for w in self.lexicon.match_tokens(original_query) if len(w) > 2}
+        expansion_ids = self.lexicon.expansion_ids(original_query)
+
         qv = self.model.encode([expanded_query], convert_to_numpy=True)[0]
         qv = qv / (np.linalg.norm(qv) + 1e-12)
 
@@ -219,15 +270,8 @@ class ArabicSearchEngine:
                 meta = dict(self.quran_metas[idx])  # copy
 
                 # Boosting (light)
-                boosted = float(scores[idx])
-                for w in original_query.split():
-                    if len(w) > 2 and w in verse_text:
-                        boosted = min(1.0, boosted * 2.0)
-                        break
-                for t in expanded_query.split():
-                    if len(t) > 2 and t in verse_text:
-                        boosted = min(1.0, boosted * 1.3)
-                        break
+                boosted = self._boost(float(scores[idx]), self.quran_tokens[idx],
+                                      query_tokens, expansion_ids, 2.0, 1.3)
 
                 meta.setdefault("citation", self._format_citation(meta))
                 hits.append({"text": verse_text, "score": boosted, "metadata": meta})
@@ -245,15 +289,8 @@ class ArabicSearchEngine:
                 hadith_text = self.hadith_texts[idx]
                 meta = dict(self.hadith_metas[idx])
 
-                boosted = float(scores[idx])
-                for w in original_query.split():
-                    if len(w) > 2 and w in hadith_text:
-                        boosted = min(1.0, boosted * 1.8)
-                        break
-                for t in expanded_query.split():
-                    if len(t) > 2 and t in hadith_text:
-                        boosted = min(1.0, boosted * 1.2)
-                        break
+                boosted = self._boost(float(scores[idx]), self.hadith_tokens[idx],
+                                      query_tokens, expansion_ids, 1.8, 1.2)
 
                 meta.setdefault("citation", self._format_citation(meta))
                 hits.append({"text": hadith_text, "score": boosted, "metadata": meta})